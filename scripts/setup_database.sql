@@ -23,7 +23,8 @@ CREATE TABLE repositories (
 -- Index for efficient updates and queries
 CREATE INDEX idx_repositories_updated_at ON repositories(updated_at);
 CREATE INDEX idx_repositories_owner ON repositories(owner_login);
-CREATE INDEX idx_repositories_stars ON repositories(stargazer_count DESC);
+-- (stargazer_count DESC, id) also serves ordered CSV exports without a sort
+CREATE INDEX idx_repositories_stars ON repositories(stargazer_count DESC, id);
 
 -- Crawl history for tracking runs
 CREATE TABLE crawl_runs (
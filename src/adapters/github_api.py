@@ -8,15 +8,26 @@ This adapter:
 3. Provides retry mechanisms
 4. Isolates external API changes from our core logic
 5. Works around the 1000 result limit per search query
+6. Batches several searches into one request via query aliases
+7. Sends persisted query hashes instead of full query documents
 """
 
+import hashlib
+import itertools
+import queue
+import threading
 import time
-import requests
-from typing import List, Generator, Optional
+from collections import deque
+from operator import attrgetter, itemgetter
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Generator, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from tenacity import (
     retry, 
+    stop_any,
     stop_after_attempt, 
     wait_exponential, 
     retry_if_exception_type,
@@ -26,8 +37,13 @@ import logging
 
 from src.models.repository import Repository
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    from ciso8601 import parse_rfc3339
+except ImportError:  # Optional C parser; stdlib fallback handles GitHub's 'Z' suffix
+    def parse_rfc3339(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Logging is configured by the entry point (src/main.py)
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +53,68 @@ class RateLimitInfo:
     remaining: int
     reset_at: datetime
     limit: int
+    cost: int = 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket pacing requests shared by all workers.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    `acquire()` takes one token, sleeping until one is available.
+    """
+    
+    # Longest uninterrupted wait when watching several stop events
+    STOP_POLL_SECONDS = 0.5
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self._capacity = max(1.0, capacity)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def reset(self, rate: float, tokens: float) -> None:
+        """Re-seed the bucket from fresh quota information."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self._capacity = max(1.0, tokens)
+            self._tokens = tokens
+    
+    def acquire(self, *stops: Optional[threading.Event]) -> bool:
+        """
+        Take one token, waiting for it if needed.
+        
+        Args:
+            stops: Events that abort the wait; None entries are ignored
+        
+        Returns:
+            False if any of `stops` is or becomes set, True otherwise
+        """
+        stops = [stop for stop in stops if stop is not None]
+        while True:
+            if any(stop.is_set() for stop in stops):
+                return False
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_seconds = (1 - self._tokens) / self.rate
+            
+            if not stops:
+                time.sleep(wait_seconds)
+                continue
+            if len(stops) > 1:
+                # Event.wait watches a single event, so poll the others
+                wait_seconds = min(wait_seconds, self.STOP_POLL_SECONDS)
+            stops[0].wait(wait_seconds)
 
 
 class GitHubAPIError(Exception):
@@ -49,6 +127,88 @@ class RateLimitExceeded(GitHubAPIError):
     pass
 
 
+class TransientAPIError(GitHubAPIError):
+    """Raised for server-side failures that are worth retrying."""
+    pass
+
+
+def _adapter_closed(retry_state) -> bool:
+    """Tenacity stop condition: give up retrying once the adapter is closed."""
+    return retry_state.args[0]._closed.is_set()
+
+
+# Sentinel a range worker puts on the results queue when it has finished
+_RANGES_DONE = object()
+
+# (min_stars, max_stars) with max_stars None for an open-ended range
+StarRange = Tuple[int, Optional[int]]
+
+# Turns a page of GraphQL repository nodes plus its fetch time into output rows
+NodeParser = Callable[[List[Optional[dict]], datetime], list]
+
+
+class _StarRangeQueue:
+    """
+    Thread-safe work queue of star ranges that workers may extend.
+    
+    Workers take groups of ranges and hand back the remainder of any range
+    they could not finish. The queue is exhausted once it is empty and no
+    taken group is still being worked on, since that group could still
+    add ranges. Ranges handed back after a failed query are retried alone,
+    so one bad range can't fail its neighbours again, up to MAX_FAILURES
+    times.
+    """
+    
+    MAX_FAILURES = 3
+    
+    def __init__(self, ranges: List[StarRange]):
+        self._pending = deque(ranges)
+        self._retrying: deque = deque()
+        self._failures: Dict[StarRange, int] = {}
+        self._in_progress = 0
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    def take(self, count: int) -> Optional[List[StarRange]]:
+        """Take up to `count` ranges; None once the queue is exhausted or closed."""
+        with self._cond:
+            while not self._closed:
+                if self._retrying:
+                    self._in_progress += 1
+                    return [self._retrying.popleft()]
+                if self._pending:
+                    self._in_progress += 1
+                    return [self._pending.popleft() for _ in range(min(count, len(self._pending)))]
+                if self._in_progress == 0:
+                    return None
+                self._cond.wait()
+            return None
+    
+    def done(self, remainders: List[StarRange], failed: List[StarRange] = ()) -> None:
+        """
+        Finish a taken group, queueing the ranges left to crawl.
+        
+        `failed` ranges are left over from a failed query and are queued
+        again unless they already failed MAX_FAILURES times.
+        """
+        with self._cond:
+            self._pending.extend(remainders)
+            for star_range in failed:
+                failures = self._failures.get(star_range, 0) + 1
+                self._failures[star_range] = failures
+                if failures <= self.MAX_FAILURES:
+                    self._retrying.append(star_range)
+                else:
+                    logger.error(f"Giving up on star range {star_range} after {failures} failed queries")
+            self._in_progress -= 1
+            self._cond.notify_all()
+    
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
 class GitHubGraphQLAdapter:
     """
     Anti-corruption layer for GitHub's GraphQL API.
@@ -58,26 +218,56 @@ class GitHubGraphQLAdapter:
     star count ranges to fetch more than 1000 repositories.
     """
     
-    # GraphQL query for searching repositories
-    SEARCH_REPOS_QUERY = """
-    query($queryString: String!, $first: Int!, $after: String) {
-        search(query: $queryString, type: REPOSITORY, first: $first, after: $after) {
-            pageInfo {
+    # Repository fields shared by every aliased search in a batched query
+    REPOSITORY_FRAGMENT = """
+    fragment RepositoryFields on Repository {
+        databaseId
+        id
+        name
+        owner {
+            login
+        }
+        stargazerCount
+    }
+    """
+    
+    # One aliased search field; {i} is the alias slot within the document
+    SEARCH_ALIAS_TEMPLATE = """
+        s{i}: search(query: $query_s{i}, type: REPOSITORY, first: $first_s{i}, after: $after_s{i}) {{
+            pageInfo {{
                 hasNextPage
                 endCursor
-            }
+            }}
             repositoryCount
-            nodes {
-                ... on Repository {
-                    databaseId
-                    id
-                    name
-                    owner {
-                        login
-                    }
-                    stargazerCount
-                }
-            }
+            nodes {{
+                ...RepositoryFields
+            }}
+        }}"""
+    
+    # Searches packed into a single request. GitHub charges a query by the
+    # number of nodes requested / 100 (minimum 1), so a handful of 100-node
+    # searches still costs one rate limit point per round-trip.
+    MAX_ALIASES_PER_QUERY = 5
+    
+    # Groups of star ranges crawled concurrently. GitHub starts flagging
+    # secondary rate limits beyond a few concurrent requests per token.
+    MAX_CONCURRENT_SEARCHES = 3
+    
+    # How often the consumer checks for cancellation while workers are quiet
+    RESULT_POLL_SECONDS = 0.5
+    
+    # Quota kept back from bursting; below it requests are paced to the
+    # refill rate. Leaves headroom for requests in flight on other workers.
+    RATE_LIMIT_RESERVE = 200
+    
+    # Share of the remaining-quota refill rate we allow ourselves
+    RATE_LIMIT_SAFETY = 0.9
+    
+    # Star counts for a batch of node IDs, used to fill in REST listings
+    NODES_QUERY = """
+    query($ids: [ID!]!) {
+        nodes(ids: $ids) {
+            ...RepositoryFields
         }
         rateLimit {
             remaining
@@ -86,10 +276,18 @@ class GitHubGraphQLAdapter:
             cost
         }
     }
-    """
+    """ + REPOSITORY_FRAGMENT
+    
+    # Ranges with at most this many stars hold most of GitHub and overflow
+    # the search cap; they are crawled via the REST id cursor instead
+    ID_CURSOR_MAX_STARS = 1
     
-    # Star ranges to partition the search (each should return <1000 repos ideally)
-    # These ranges are designed to get diverse repositories
+    # Most results a single search can page through
+    SEARCH_RESULT_CAP = 1000
+    
+    # Seed star ranges to partition the search. Ranges are crawled by stars
+    # descending; one that hits SEARCH_RESULT_CAP resumes below its last
+    # star count (keyset pagination), so none needs to fit under the cap.
     STAR_RANGES = [
         # High star repos (fewer repos, but important)
         (100000, None),   # 100k+ stars
@@ -111,83 +309,150 @@ class GitHubGraphQLAdapter:
         (0, 0),           # 0 stars
     ]
     
-    def __init__(self, token: str, endpoint: str = 'https://api.github.com/graphql'):
+    def __init__(
+        self,
+        token: str,
+        endpoint: str = 'https://api.github.com/graphql',
+        rest_endpoint: str = 'https://api.github.com',
+        aliases_per_query: int = MAX_ALIASES_PER_QUERY,
+        max_workers: int = MAX_CONCURRENT_SEARCHES,
+        persisted_queries: bool = False
+    ):
         self._token = token
         self._endpoint = endpoint
-        self._session = requests.Session()
-        self._session.headers.update({
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json',
-            'User-Agent': 'GitHub-Crawler-Bot/1.0'
-        })
+        self._rest_endpoint = rest_endpoint.rstrip('/')
+        self._aliases_per_query = max(1, aliases_per_query)
+        self._max_workers = max(1, max_workers)
+        self._batched_queries: Dict[int, str] = {}
+        self._persisted_queries = persisted_queries
+        self._query_hashes: Dict[str, str] = {}  # query document -> sha256
+        self._encoded_queries: Dict[str, bytes] = {}  # query document -> JSON string
+        self._registered_queries: Set[str] = set()  # hashes the server has seen
+        # HTTP/2 multiplexes every worker's requests over a few kept-alive
+        # connections instead of one HTTP/1.1 connection per in-flight request
+        self._client = httpx.Client(
+            http2=True,
+            headers={
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json',
+                'User-Agent': 'GitHub-Crawler-Bot/1.0',
+                'Accept-Encoding': 'gzip'
+            },
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=max(8, self._max_workers),
+                max_keepalive_connections=8
+            )
+        )
         self._last_rate_limit: Optional[RateLimitInfo] = None
+        # Lets each worker send its first request; re-seeded from rateLimit after every response
+        self._bucket = TokenBucket(rate=1.0, capacity=self._max_workers)
+        self._closed = threading.Event()  # Interrupts rate limit waits on close()
     
     def _parse_rate_limit(self, rate_limit_data: dict) -> RateLimitInfo:
         """Parse rate limit info from API response."""
         reset_at_str = rate_limit_data.get('resetAt', '')
         if reset_at_str:
-            reset_at = datetime.fromisoformat(reset_at_str.replace('Z', '+00:00'))
+            reset_at = parse_rfc3339(reset_at_str)
         else:
             reset_at = datetime.now(timezone.utc)
         
         return RateLimitInfo(
             remaining=rate_limit_data.get('remaining', 0),
             reset_at=reset_at,
-            limit=rate_limit_data.get('limit', 5000)
+            limit=rate_limit_data.get('limit', 5000),
+            cost=rate_limit_data.get('cost', 1)
         )
     
     def _check_and_handle_rate_limit(self, rate_limit_info: RateLimitInfo) -> None:
-        """Check and handle rate limiting proactively."""
+        """Record the latest rate limit info and re-seed the request bucket."""
         self._last_rate_limit = rate_limit_info
         
-        # If we're running low on requests, wait for reset
-        if rate_limit_info.remaining < 50:
-            now = datetime.now(timezone.utc)
-            wait_seconds = (rate_limit_info.reset_at - now).total_seconds()
-            
-            if wait_seconds > 0:
-                logger.warning(
-                    f"Rate limit low ({rate_limit_info.remaining} remaining). "
-                    f"Waiting {wait_seconds:.0f}s until reset..."
-                )
-                time.sleep(wait_seconds + 2)  # Add buffer
-            
+        # Shrink the alias fan-out if a batched query started costing extra points
+        if rate_limit_info.cost > 1 and self._aliases_per_query > 1:
+            self._aliases_per_query -= 1
+            logger.info(
+                f"Query cost {rate_limit_info.cost} > 1, "
+                f"reducing searches per request to {self._aliases_per_query}"
+            )
+        
+        # Quota above the reserve can be spent right away; the rest is paced
+        # so the remaining requests spread out until the reset. With nothing
+        # left, the single token only refills around the reset time.
+        now = datetime.now(timezone.utc)
+        seconds_to_reset = max(1.0, (rate_limit_info.reset_at - now).total_seconds())
+        rate = max(rate_limit_info.remaining, 1) / seconds_to_reset
+        self._bucket.reset(
+            rate=rate * self.RATE_LIMIT_SAFETY,
+            tokens=max(0, rate_limit_info.remaining - self.RATE_LIMIT_RESERVE)
+        )
+        
         # Log rate limit status periodically
-        elif rate_limit_info.remaining % 100 == 0:
-            logger.info(f"Rate limit: {rate_limit_info.remaining}/{rate_limit_info.limit} remaining")
+        if rate_limit_info.remaining % 100 == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Rate limit: %d/%d remaining",
+                rate_limit_info.remaining,
+                rate_limit_info.limit
+            )
+        if rate_limit_info.remaining < self.RATE_LIMIT_RESERVE and rate_limit_info.remaining % 50 == 0:
+            logger.warning(
+                f"Rate limit low ({rate_limit_info.remaining} remaining). "
+                f"Pacing requests until reset in {seconds_to_reset:.0f}s..."
+            )
+    
+    def _query_hash(self, query: str) -> str:
+        """sha256 of a query document, computed once per document."""
+        query_hash = self._query_hashes.get(query)
+        if query_hash is None:
+            query_hash = hashlib.sha256(query.encode('utf-8')).hexdigest()
+            self._query_hashes[query] = query_hash
+        return query_hash
+    
+    def _encoded_query(self, query: str) -> bytes:
+        """JSON-encoded query document, serialized once per document."""
+        encoded = self._encoded_queries.get(query)
+        if encoded is None:
+            encoded = orjson.dumps(query)
+            self._encoded_queries[query] = encoded
+        return encoded
     
     @retry(
-        stop=stop_after_attempt(5),
+        stop=stop_any(stop_after_attempt(5), _adapter_closed),
         wait=wait_exponential(multiplier=2, min=4, max=120),
-        retry=retry_if_exception_type((requests.RequestException, requests.Timeout)),
+        retry=retry_if_exception_type((httpx.RequestError, TransientAPIError)),
         before_sleep=before_sleep_log(logger, logging.WARNING)
     )
-    def _execute_query(self, query: str, variables: dict) -> dict:
-        """Execute GraphQL query with retry logic and error handling."""
+    def _send_query(self, query: str, variables: dict, allow_partial: bool = False) -> dict:
+        """
+        Send GraphQL query with retry logic and error handling.
+        
+        With `allow_partial`, errors that come back alongside `data` (e.g.
+        NOT_FOUND/FORBIDDEN for single ids of a `nodes` lookup, whose
+        nodes are null) are logged and the partial data is returned; only
+        a response without data fails.
+        
+        Optionally uses Automatic Persisted Queries (off by default, since
+        GitHub itself doesn't implement them): a document is sent in full
+        once together with its sha256 hash, later requests send only the
+        hash. If the server doesn't know the hash, the full document is
+        re-sent; any other failure of a hash-only request turns persisted
+        queries off.
+        """
         try:
-            response = self._session.post(
-                self._endpoint,
-                json={'query': query, 'variables': variables},
-                timeout=30
-            )
-            
-            # Handle HTTP errors
-            if response.status_code == 403:
-                # Check if it's rate limiting
-                if 'rate limit' in response.text.lower():
-                    logger.warning("Rate limit exceeded via HTTP 403, waiting 60s...")
-                    time.sleep(60)
-                    raise RateLimitExceeded("Rate limit exceeded")
-                raise GitHubAPIError(f"Forbidden: {response.text}")
-            
-            if response.status_code == 502 or response.status_code == 503:
-                logger.warning(f"GitHub server error ({response.status_code}), retrying...")
-                raise requests.RequestException(f"Server error: {response.status_code}")
-            
-            if response.status_code != 200:
-                raise GitHubAPIError(f"API error: {response.status_code} - {response.text}")
+            query_hash = self._query_hash(query)
+            hash_only = self._persisted_queries and query_hash in self._registered_queries
+            if hash_only:
+                data = self._post_hash_only(query, variables, query_hash)
+            else:
+                data = self._post_graphql(query, variables, query_hash, include_query=True)
             
-            data = response.json()
+            # Partial results: per-node errors next to null nodes
+            if 'errors' in data and allow_partial and data.get('data'):
+                logger.warning(
+                    f"{len(data['errors'])} GraphQL errors in partial response, "
+                    f"first: {data['errors'][0].get('message', data['errors'][0])}"
+                )
+                data = {'data': data['data']}
             
             # Handle GraphQL errors
             if 'errors' in data:
@@ -203,43 +468,210 @@ class GitHubGraphQLAdapter:
                 # Some errors are recoverable, log and continue
                 if 'timeout' in error_str.lower() or 'loading' in error_str.lower():
                     logger.warning(f"Transient GraphQL error: {error_str}")
-                    raise requests.RequestException(error_str)
+                    raise TransientAPIError(error_str)
                 
                 raise GitHubAPIError(f"GraphQL errors: {error_str}")
             
+            if self._persisted_queries:
+                self._registered_queries.add(query_hash)
+            
             return data.get('data', {})
             
-        except requests.Timeout:
+        except httpx.TimeoutException:
             logger.warning("Request timeout, will retry...")
             raise
     
-    def _search_with_query(
+    def _post_hash_only(self, query: str, variables: dict, query_hash: str) -> dict:
+        """
+        Send a persisted query by hash, falling back to the full document.
+        
+        Rate limit and transient server errors propagate for the caller's
+        retry; any other HTTP or GraphQL failure means the hash is unusable,
+        so it is forgotten and the full document is sent instead.
+        """
+        try:
+            data = self._post_graphql(query, variables, query_hash, include_query=False)
+        except (RateLimitExceeded, TransientAPIError):
+            raise
+        except GitHubAPIError as e:
+            logger.debug(f"Hash-only query failed: {e}")
+            data = None
+        
+        if data is not None and not ('errors' in data and not data.get('data')):
+            return data
+        
+        not_found = data is not None and any(
+            'PersistedQueryNotFound' in (
+                e.get('message', ''),
+                (e.get('extensions') or {}).get('code', '')
+            )
+            for e in data['errors']
+        )
+        self._registered_queries.discard(query_hash)
+        if not not_found:
+            logger.info("Persisted queries not supported by the endpoint, sending full queries")
+            self._persisted_queries = False
+        return self._post_graphql(query, variables, query_hash, include_query=True)
+    
+    def _post_graphql(
         self,
-        query_string: str,
+        query: str,
+        variables: dict,
+        query_hash: str,
+        include_query: bool
+    ) -> dict:
+        """
+        POST one GraphQL request and return the decoded JSON body.
+        
+        The body is spliced from pre-encoded pieces: the query document and
+        the persisted query extension are serialized once per document,
+        only the variables are encoded per request.
+        """
+        # orjson encodes/decodes several times faster than the stdlib json
+        parts = [b'{"variables":', orjson.dumps(variables)]
+        if include_query:
+            parts += [b',"query":', self._encoded_query(query)]
+        if self._persisted_queries:
+            parts += [
+                b',"extensions":{"persistedQuery":{"version":1,"sha256Hash":"',
+                query_hash.encode('ascii'),
+                b'"}}'
+            ]
+        parts.append(b'}')
+        
+        response = self._client.post(self._endpoint, content=b''.join(parts))
+        
+        # Handle HTTP errors
+        if response.status_code == 403:
+            # Check if it's rate limiting
+            if 'rate limit' in response.text.lower():
+                logger.warning("Rate limit exceeded via HTTP 403, waiting 60s...")
+                time.sleep(60)
+                raise RateLimitExceeded("Rate limit exceeded")
+            raise GitHubAPIError(f"Forbidden: {response.text}")
+        
+        if response.status_code == 502 or response.status_code == 503:
+            logger.warning(f"GitHub server error ({response.status_code}), retrying...")
+            raise TransientAPIError(f"Server error: {response.status_code}")
+        
+        if response.status_code != 200:
+            raise GitHubAPIError(f"API error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)
+    
+    @retry(
+        stop=stop_any(stop_after_attempt(5), _adapter_closed),
+        wait=wait_exponential(multiplier=2, min=4, max=120),
+        retry=retry_if_exception_type((httpx.RequestError, TransientAPIError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING)
+    )
+    def _get_rest(self, path: str, params: dict) -> list:
+        """GET a REST API resource with retry logic and error handling."""
+        response = self._client.get(
+            f"{self._rest_endpoint}{path}",
+            params=params,
+            headers={'Accept': 'application/vnd.github+json'}
+        )
+        
+        # REST has its own quota, reported in headers
+        if response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_at = int(response.headers.get('X-RateLimit-Reset', '0'))
+            wait_seconds = max(0, reset_at - time.time())
+            logger.warning(f"REST rate limit exceeded, waiting {wait_seconds:.0f}s until reset...")
+            self._closed.wait(wait_seconds + 2)  # Add buffer
+            raise TransientAPIError("REST rate limit exceeded")
+        
+        if response.status_code == 502 or response.status_code == 503:
+            logger.warning(f"GitHub server error ({response.status_code}), retrying...")
+            raise TransientAPIError(f"Server error: {response.status_code}")
+        
+        if response.status_code != 200:
+            raise GitHubAPIError(f"API error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)
+    
+    def _build_batched_query(self, alias_count: int) -> str:
+        """
+        Build a GraphQL document with `alias_count` aliased searches.
+        
+        Each alias `sN` takes its own `$query_sN`, `$first_sN` and `$after_sN`
+        variables, so the document only depends on the number of aliases and
+        is built once per size.
+        """
+        query = self._batched_queries.get(alias_count)
+        if query is None:
+            params = ', '.join(
+                f'$query_s{i}: String!, $first_s{i}: Int!, $after_s{i}: String'
+                for i in range(alias_count)
+            )
+            searches = ''.join(
+                self.SEARCH_ALIAS_TEMPLATE.format(i=i) for i in range(alias_count)
+            )
+            query = (
+                f"query({params}) {{{searches}\n"
+                "        rateLimit {\n"
+                "            remaining\n"
+                "            resetAt\n"
+                "            limit\n"
+                "            cost\n"
+                "        }\n"
+                "    }\n"
+                f"{self.REPOSITORY_FRAGMENT}"
+            )
+            self._batched_queries[alias_count] = query
+        return query
+    
+    def _search_batched(
+        self,
+        query_strings: List[str],
         batch_size: int = 100,
-        max_results: int = 1000
-    ) -> Generator[List[Repository], None, None]:
+        max_results: int = 1000,
+        parse_nodes: NodeParser = Repository.from_graphql_response_batch,
+        capped: Optional[Dict[int, int]] = None,
+        failed: Optional[Dict[int, Optional[int]]] = None,
+        stop: Optional[threading.Event] = None
+    ) -> Generator[Tuple[str, list], None, None]:
         """
-        Search repositories with a specific query string.
+        Search several query strings at once, one aliased search per query.
         
-        Limited to max 1000 results per GitHub API limitation.
+        Every request carries one alias per query that still has pages left;
+        exhausted queries are dropped from the next request. Each query is
+        limited to max 1000 results per GitHub API limitation.
+        
+        If `capped` is given, it receives {query index: star count of the
+        last node} for every query that stopped at `max_results` while
+        reporting more matching repositories. If a request fails, `failed`
+        receives {query index: star count of the last node, or None} for
+        every query that was still paging. Setting `stop` ends the search
+        before the next request, even while it waits for rate limit quota.
+        
+        Yields:
+            (query_string, parsed page) for every page of every alias
         """
-        cursor = None
-        total_fetched = 0
+        cursors: Dict[int, Optional[str]] = {i: None for i in range(len(query_strings))}
+        # Raw nodes returned per query, null/malformed ones included: the
+        # search cap counts results, not parsed repositories
+        fetched = {i: 0 for i in cursors}
+        last_stars: Dict[int, Optional[int]] = {i: None for i in cursors}
         
-        while total_fetched < max_results:
-            current_batch_size = min(batch_size, max_results - total_fetched)
+        while cursors:
+            # Pace requests across all workers; returns False once closed or stopped
+            if not self._bucket.acquire(self._closed, stop):
+                break
             
-            variables = {
-                'queryString': query_string,
-                'first': current_batch_size,
-                'after': cursor
-            }
+            active = list(cursors)
+            variables = {}
+            for slot, i in enumerate(active):
+                variables[f'query_s{slot}'] = query_strings[i]
+                variables[f'first_s{slot}'] = min(batch_size, max_results - fetched[i])
+                variables[f'after_s{slot}'] = cursors[i]
             
             try:
-                data = self._execute_query(self.SEARCH_REPOS_QUERY, variables)
-            except (GitHubAPIError, RateLimitExceeded) as e:
+                data = self._send_query(self._build_batched_query(len(active)), variables)
+            except GitHubAPIError as e:
                 logger.error(f"Query failed: {e}")
+                if failed is not None:
+                    failed.update((i, last_stars[i]) for i in cursors)
                 break
             
             # Handle rate limiting
@@ -247,112 +679,385 @@ class GitHubGraphQLAdapter:
                 rate_limit = self._parse_rate_limit(data['rateLimit'])
                 self._check_and_handle_rate_limit(rate_limit)
             
-            search_data = data.get('search', {})
-            nodes = search_data.get('nodes', [])
+            fetched_at = datetime.now(timezone.utc)  # One timestamp per API response
             
-            if not nodes:
+            for slot, i in enumerate(active):
+                search_data = data.get(f's{slot}') or {}
+                nodes = search_data.get('nodes', [])
+                
+                # Transform to domain objects (or rows), filtering out null nodes
+                repositories = parse_nodes(nodes, fetched_at)
+                
+                if repositories:
+                    yield query_strings[i], repositories
+                
+                fetched[i] += len(nodes)
+                last_node = next((node for node in reversed(nodes) if node), None)
+                if last_node:
+                    last_stars[i] = last_node.get('stargazerCount') or 0
+                
+                # Only re-issue aliases that have more pages
+                page_info = search_data.get('pageInfo', {})
+                if (
+                    not nodes
+                    or not page_info.get('hasNextPage', False)
+                    or fetched[i] >= max_results
+                ):
+                    del cursors[i]
+                    # GitHub stops paging at the cap, so compare against the total
+                    if (
+                        capped is not None
+                        and last_node
+                        and fetched[i] >= max_results
+                        and search_data.get('repositoryCount', 0) > fetched[i]
+                    ):
+                        capped[i] = last_stars[i]
+                else:
+                    cursors[i] = page_info.get('endCursor')
+    
+    def _crawl_by_id_cursor(
+        self,
+        parse_nodes: NodeParser = Repository.from_graphql_response_batch,
+        since: int = 0,
+        cancel: Optional[threading.Event] = None
+    ) -> Generator[Tuple[str, list], None, None]:
+        """
+        List repositories by ascending id via REST `/repositories?since=`.
+        
+        Unlike search, the id cursor has no 1000 result cap. REST listings
+        carry no star counts, so each page of 100 is looked up in a single
+        GraphQL `nodes` query, which also returns everything a Repository
+        needs. Deleted or blocked ids come back as null nodes with per-node
+        errors and are dropped; a failed lookup skips just that page.
+        Setting `cancel` ends the listing, even while it waits for rate
+        limit quota.
+        
+        Yields:
+            (cursor description, parsed page) per page
+        """
+        while self._bucket.acquire(self._closed, cancel):
+            try:
+                listing = self._get_rest('/repositories', {'since': since, 'per_page': 100})
+            except GitHubAPIError as e:
+                logger.error(f"Repository listing failed: {e}")
                 break
             
-            # Transform to domain objects, filtering out null nodes
-            repositories = []
-            for node in nodes:
-                if node is not None and node.get('databaseId') is not None:
-                    try:
-                        repo = Repository.from_graphql_response(node)
-                        repositories.append(repo)
-                    except (KeyError, TypeError) as e:
-                        logger.warning(f"Skipping malformed node: {e}")
-                        continue
-            
-            if repositories:
-                yield repositories
+            if not listing:
+                break
             
-            total_fetched += len(repositories)
+            node_ids = [item['node_id'] for item in listing if item.get('node_id')]
+            label = f"repositories since id {since}"
+            since = listing[-1]['id']
+            if not node_ids:
+                continue
             
-            # Check for more pages
-            page_info = search_data.get('pageInfo', {})
-            if not page_info.get('hasNextPage', False):
-                break
+            try:
+                data = self._send_query(self.NODES_QUERY, {'ids': node_ids}, allow_partial=True)
+            except GitHubAPIError as e:
+                # Skip this page only; the id cursor has already moved past it
+                logger.error(f"Query failed for {label}: {e}")
+                continue
             
-            cursor = page_info.get('endCursor')
+            if 'rateLimit' in data:
+                rate_limit = self._parse_rate_limit(data['rateLimit'])
+                self._check_and_handle_rate_limit(rate_limit)
             
-            # Small delay between requests to be nice to the API
-            time.sleep(0.1)
+            repositories = parse_nodes(data.get('nodes') or [], datetime.now(timezone.utc))
+            if repositories:
+                yield label, repositories
     
-    def search_repositories(
+    def _collect_range_results(
         self,
-        query_string: str = "stars:>=0",
-        batch_size: int = 100,
-        max_repos: int = 100_000
-    ) -> Generator[List[Repository], None, None]:
+        results: queue.Queue,
+        workers_left: int,
+        cancel: Optional[threading.Event] = None
+    ) -> Generator[Tuple[str, list], None, None]:
+        """Yield worker pages from the results queue until all workers are done or `cancel` is set."""
+        while workers_left:
+            try:
+                item = results.get(timeout=self.RESULT_POLL_SECONDS)
+            except queue.Empty:
+                if self._closed.is_set() or (cancel is not None and cancel.is_set()):
+                    return
+                continue
+            if item is _RANGES_DONE:
+                workers_left -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    @staticmethod
+    def _range_query(star_range: StarRange) -> str:
+        """Search query string for a star range, most starred first."""
+        min_stars, max_stars = star_range
+        if max_stars is None:
+            star_query = f"stars:>={min_stars}"
+        elif min_stars == max_stars:
+            star_query = f"stars:{min_stars}"
+        else:
+            star_query = f"stars:{min_stars}..{max_stars}"
+        return f"{star_query} sort:stars-desc"
+    
+    @staticmethod
+    def _remaining_range(star_range: StarRange, last_stars: int) -> Optional[StarRange]:
         """
-        Search repositories and yield them in batches.
+        Range left to crawl after a stars-desc search stopped at the cap.
+        
+        Resumes at the last star count seen (the repeats at that boundary
+        are dropped by the de-duplication). If the whole capped page had
+        that same star count there is no progress to make, so the rest of
+        that star count is skipped.
+        """
+        min_stars, max_stars = star_range
+        if max_stars is None or last_stars < max_stars:
+            return (min_stars, last_stars)
+        
+        logger.warning(
+            f"More than {GitHubGraphQLAdapter.SEARCH_RESULT_CAP} repositories with "
+            f"{last_stars} stars, the rest of them are skipped"
+        )
+        if min_stars < max_stars:
+            return (min_stars, max_stars - 1)
+        return None
+    
+    def _drain_ranges(
+        self,
+        ranges: _StarRangeQueue,
+        batch_size: int,
+        max_results: int,
+        parse_nodes: NodeParser,
+        results: queue.Queue,
+        stop: threading.Event
+    ) -> None:
+        """
+        Worker body: take groups of star ranges and page through them into `results`.
+        
+        A range that runs into the search cap is queued again for its
+        remaining, lower star counts; so is every unfinished range of a
+        group whose query failed. Errors are handed to the consumer
+        through the queue, and the worker always finishes by putting
+        `_RANGES_DONE`.
+        """
+        try:
+            while not stop.is_set():
+                group = ranges.take(self._aliases_per_query)
+                if group is None:
+                    break
+                
+                capped: Dict[int, int] = {}
+                failed: Dict[int, Optional[int]] = {}
+                try:
+                    queries = [self._range_query(star_range) for star_range in group]
+                    logger.info(f"Searching: {', '.join(queries)}")
+                    for item in self._search_batched(
+                        queries,
+                        batch_size,
+                        max_results,
+                        parse_nodes,
+                        capped,
+                        failed,
+                        stop
+                    ):
+                        if stop.is_set():
+                            break
+                        self._put_result(results, item, stop)
+                finally:
+                    remainders = []
+                    for i, last_stars in capped.items():
+                        remainder = self._remaining_range(group[i], last_stars)
+                        if remainder is not None:
+                            remainders.append(remainder)
+                    # Resume failed ranges below the last star count reached
+                    retries = [
+                        group[i] if last is None else (group[i][0], last)
+                        for i, last in failed.items()
+                    ]
+                    ranges.done(remainders, retries)
+        except Exception as e:
+            self._put_result(results, e, stop)
+        finally:
+            self._put_result(results, _RANGES_DONE, stop)
+    
+    @staticmethod
+    def _put_result(results: queue.Queue, item: object, stop: threading.Event) -> None:
+        """Put onto the bounded results queue unless the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def _search_pages(
+        self,
+        batch_size: int,
+        max_repos: int,
+        parse_nodes: NodeParser,
+        row_id: Callable[[Any], int],
+        cancel: Optional[threading.Event] = None
+    ) -> Generator[list, None, None]:
+        """
+        Crawl repositories and yield de-duplicated batches of parsed rows.
         
         Works around the 1000 result limit by partitioning searches
-        by star count ranges. Uses cursor-based pagination within each range.
+        by star count ranges, each sorted by stars descending; a range that
+        hits the limit resumes below the last star count it reached
+        (keyset pagination). Several ranges are fetched per
+        request as aliased searches, each using cursor-based pagination,
+        and groups of ranges are crawled concurrently on a small thread
+        pool. The low-star tail, far beyond the search cap, is then listed
+        by the REST id cursor until max_repos is reached.
         
         Args:
-            query_string: Base query (additional filters will be added)
             batch_size: Number of repos per API call (max 100)
             max_repos: Maximum total repos to fetch
+            parse_nodes: Converts a page of GraphQL nodes into rows
+            row_id: Extracts the repository id from a row for de-duplication
+            cancel: Set by the caller to end the crawl early; waits on
+                workers or rate limit quota return promptly
         
         Yields:
-            Batches of Repository objects for memory efficiency
+            Batches of rows for memory efficiency
         """
         total_fetched = 0
-        seen_ids = set()  # Track unique repos to avoid duplicates
+        batch_count = 0
+        # Track unique repos to avoid duplicates (consumer thread only). A set
+        # of ints is a few MB at the 100k target and, unlike a Bloom filter,
+        # never drops a repository as a false positive.
+        seen_ids: Set[int] = set()
         
         logger.info(f"Starting search for {max_repos} repositories...")
         
-        for min_stars, max_stars in self.STAR_RANGES:
-            if total_fetched >= max_repos:
-                break
-            
-            # Build query for this star range
-            if max_stars is None:
-                star_query = f"stars:>={min_stars}"
-            elif min_stars == max_stars:
-                star_query = f"stars:{min_stars}"
-            else:
-                star_query = f"stars:{min_stars}..{max_stars}"
-            
-            full_query = f"{star_query} sort:updated"
-            logger.info(f"Searching: {full_query}")
-            
-            range_fetched = 0
-            
-            for batch in self._search_with_query(
-                query_string=full_query,
-                batch_size=batch_size,
-                max_results=min(1000, max_repos - total_fetched)
-            ):
+        # Seed ranges, minus the tail covered by the id cursor
+        ranges = _StarRangeQueue([
+            (min_stars, max_stars)
+            for min_stars, max_stars in self.STAR_RANGES
+            if max_stars is None or max_stars > self.ID_CURSOR_MAX_STARS
+        ])
+        
+        # Bounded so workers can't run far ahead of the consumer
+        results: queue.Queue = queue.Queue(maxsize=self._max_workers * 2)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='star-range'
+        )
+        for _ in range(self._max_workers):
+            executor.submit(
+                self._drain_ranges,
+                ranges,
+                batch_size,
+                min(self.SEARCH_RESULT_CAP, max_repos),
+                parse_nodes,
+                results,
+                stop
+            )
+        
+        # Id cursor only starts once every range worker has finished
+        sources = itertools.chain(
+            self._collect_range_results(results, self._max_workers, cancel),
+            self._crawl_by_id_cursor(parse_nodes, cancel=cancel)
+        )
+        try:
+            for source, batch in sources:
                 # Filter out duplicates
                 unique_repos = []
                 for repo in batch:
-                    if repo.id not in seen_ids:
-                        seen_ids.add(repo.id)
+                    repo_id = row_id(repo)
+                    if repo_id not in seen_ids:
+                        seen_ids.add(repo_id)
                         unique_repos.append(repo)
                 
+                # Workers page in parallel, so trim the overshoot past max_repos
+                unique_repos = unique_repos[:max_repos - total_fetched]
+                
                 if unique_repos:
                     yield unique_repos
                     total_fetched += len(unique_repos)
-                    range_fetched += len(unique_repos)
+                    batch_count += 1
                     
-                    logger.info(
-                        f"Progress: {total_fetched}/{max_repos} total, "
-                        f"{range_fetched} from current range ({star_query})"
-                    )
+                    # Progress logging every 10 batches; lazy %-formatting
+                    if batch_count % 10 == 0:
+                        logger.info(
+                            "Progress: %d/%d total (last batch from %s)",
+                            total_fetched,
+                            max_repos,
+                            source
+                        )
                 
                 if total_fetched >= max_repos:
                     break
+        finally:
+            # Release workers blocked on either queue
+            stop.set()
+            ranges.close()
+            executor.shutdown(wait=False)
         
         logger.info(f"Search complete. Total unique repositories: {total_fetched}")
     
+    def search_repositories(
+        self,
+        query_string: str = "stars:>=0",
+        batch_size: int = 100,
+        max_repos: int = 100_000,
+        cancel: Optional[threading.Event] = None
+    ) -> Generator[List[Repository], None, None]:
+        """
+        Search repositories and yield them in batches.
+        
+        See `_search_pages` for how the 1000 result search limit is
+        worked around.
+        
+        Args:
+            query_string: Base query (additional filters will be added)
+            batch_size: Number of repos per API call (max 100)
+            max_repos: Maximum total repos to fetch
+            cancel: Set from another thread to end the crawl early
+        
+        Yields:
+            Batches of Repository objects for memory efficiency
+        """
+        return self._search_pages(
+            batch_size,
+            max_repos,
+            Repository.from_graphql_response_batch,
+            attrgetter('id'),
+            cancel
+        )
+    
+    def search_repositories_raw(
+        self,
+        batch_size: int = 100,
+        max_repos: int = 100_000,
+        cancel: Optional[threading.Event] = None
+    ) -> Generator[List[tuple], None, None]:
+        """
+        Search repositories and yield batches of plain export rows.
+        
+        Same crawl as `search_repositories`, but nodes go straight into
+        `Repository.EXPORT_COLUMNS` tuples without allocating Repository
+        objects. Meant for export-only paths that skip validation-heavy
+        processing such as the database upsert. `cancel` works as in
+        `search_repositories`.
+        
+        Yields:
+            Batches of row tuples
+        """
+        return self._search_pages(
+            batch_size,
+            max_repos,
+            Repository.rows_from_graphql,
+            itemgetter(0),
+            cancel
+        )
+    
     def get_rate_limit_status(self) -> Optional[RateLimitInfo]:
         """Get current rate limit status."""
         return self._last_rate_limit
     
     def close(self):
         """Clean up resources."""
-        self._session.close()
+        self._closed.set()
+        self._client.close()
         logger.info("GitHub API adapter closed")
@@ -24,8 +24,11 @@ class DatabaseConfig:
 class GitHubConfig:
     token: str
     graphql_endpoint: str = 'https://api.github.com/graphql'
+    rest_endpoint: str = 'https://api.github.com'
     max_repos: int = 100_000
     batch_size: int = 100  # Repos per query (max 100)
+    aliases_per_query: int = 5  # Star-range searches batched per request
+    max_workers: int = 3  # Star-range groups crawled concurrently
     
     @classmethod
     def from_env(cls) -> 'GitHubConfig':
@@ -7,6 +7,9 @@ This script orchestrates the complete crawl process:
 2. Initialize the crawler service
 3. Execute the crawl
 4. Export results
+
+Set CRAWL_MODE=csv to skip PostgreSQL and write the crawl straight to
+OUTPUT_PATH.
 """
 
 import os
@@ -56,20 +59,35 @@ def main() -> int:
     logger.info(f"Configuration loaded:")
     logger.info(f"  - Target repos: {github_config.max_repos:,}")
     logger.info(f"  - Batch size: {github_config.batch_size}")
-    logger.info(f"  - Database: {db_config.host}:{db_config.port}/{db_config.database}")
+    
+    crawl_mode = os.getenv('CRAWL_MODE', 'db').lower()
+    if crawl_mode not in ('db', 'csv'):
+        logger.error(f"Unknown CRAWL_MODE '{crawl_mode}', expected 'db' or 'csv'")
+        return 1
+    output_path = os.getenv('OUTPUT_PATH', 'repositories.csv')
+    if crawl_mode == 'db':
+        logger.info(f"  - Database: {db_config.host}:{db_config.port}/{db_config.database}")
+    else:
+        logger.info(f"  - Output: {output_path} (database skipped)")
+    
+    # Create crawler service
+    crawler = GitHubCrawlerService(github_config, db_config)
     
     try:
-        # Create crawler service
-        crawler = GitHubCrawlerService(github_config, db_config)
+        if crawl_mode == 'csv':
+            written = crawler.crawl_to_csv(output_path)
+            logger.info(f"Data written to: {output_path} ({written:,} rows)")
+            return 0
         
         # Execute the crawl
-        # Using "stars:>=0" to get repositories with any number of stars
-        # sorted by update time to get a diverse set
+        # Using "stars:>=0" to get repositories with any number of stars;
+        # the adapter splits it into star count ranges searched with
+        # sort:stars-desc (most starred first) to get past the 1000
+        # result cap, then lists the low-star tail by repository id
         stats = crawler.crawl_stars(search_query="stars:>=0")
         
-        # Export results to CSV
-        output_path = os.getenv('OUTPUT_PATH', 'repositories.csv')
-        exported = crawler.export_data(output_path)
+        # Export results to CSV, most starred first as before
+        exported = crawler.export_data(output_path, ordered=True)
         
         # Print final summary
         logger.info("\n" + "=" * 60)
@@ -90,6 +108,8 @@ def main() -> int:
     except Exception as e:
         logger.exception(f"Crawler failed with error: {e}")
         return 1
+    finally:
+        crawler.close()
 
 
 if __name__ == '__main__':
@@ -6,29 +6,42 @@ Following the principle of immutability for data transfer objects
 to prevent accidental mutations and ensure thread safety.
 """
 
+import logging
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime
+from typing import ClassVar, List, Optional, Tuple
 
+logger = logging.getLogger(__name__)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Repository:
     """
     Represents a GitHub repository - immutable data transfer object.
     
     All fields are read-only after creation to ensure data integrity
     as objects pass through different layers of the application.
+    Slotted to keep per-instance memory low across large batches.
     """
     id: int                    # GitHub's database ID (stable identifier)
     node_id: str               # GitHub's GraphQL node ID
-    full_name: str             # e.g., "microsoft/vscode"
     owner_login: str           # Repository owner username
     name: str                  # Repository name
     stargazer_count: int       # Number of stars
     fetched_at: datetime       # When this data was fetched
+    
+    # Column order of export rows (see rows_from_graphql)
+    EXPORT_COLUMNS: ClassVar[Tuple[str, ...]] = (
+        'id', 'node_id', 'full_name', 'owner_login', 'name', 'stargazer_count', 'fetched_at'
+    )
 
+    @property
+    def full_name(self) -> str:
+        """Owner-qualified name, e.g. "microsoft/vscode"; built on access."""
+        return f"{self.owner_login}/{self.name}"
+    
     @classmethod
-    def from_graphql_response(cls, node: dict) -> 'Repository':
+    def from_graphql_response(cls, node: dict, fetched_at: datetime) -> 'Repository':
         """
         Factory method to create Repository from GitHub GraphQL API response.
         
@@ -37,6 +50,7 @@ class Repository:
         
         Args:
             node: Dictionary containing repository data from GraphQL response
+            fetched_at: When the response containing this node was fetched
             
         Returns:
             Repository instance with validated data
@@ -45,36 +59,107 @@ class Repository:
             KeyError: If required fields are missing
             TypeError: If field types are invalid
         """
-        # Extract and validate required fields
-        database_id = node.get('databaseId')
+        # Extract and validate required fields. GraphQL always returns every
+        # selected field (null when unset), so keys are indexed directly.
+        database_id = node['databaseId']
         if database_id is None:
             raise KeyError("databaseId is required")
         
-        node_id = node.get('id')
+        node_id = node['id']
         if not node_id:
             raise KeyError("id (node_id) is required")
         
-        owner = node.get('owner', {})
+        owner = node['owner'] or {}
         owner_login = owner.get('login')
         if not owner_login:
             raise KeyError("owner.login is required")
         
-        name = node.get('name')
+        name = node['name']
         if not name:
             raise KeyError("name is required")
         
-        stargazer_count = node.get('stargazerCount', 0)
+        # GraphQL JSON already types Int/String/ID fields, so values are
+        # used as-is; the check only guards against schema drift.
+        if __debug__:
+            assert isinstance(database_id, int), f"databaseId is {type(database_id).__name__}"
         
         return cls(
-            id=int(database_id),
-            node_id=str(node_id),
-            full_name=f"{owner_login}/{name}",
-            owner_login=str(owner_login),
-            name=str(name),
-            stargazer_count=int(stargazer_count) if stargazer_count is not None else 0,
-            fetched_at=datetime.now(timezone.utc)
+            id=database_id,
+            node_id=node_id,
+            owner_login=owner_login,
+            name=name,
+            stargazer_count=node['stargazerCount'] or 0,
+            fetched_at=fetched_at
         )
     
+    @classmethod
+    def from_graphql_response_batch(
+        cls,
+        nodes: List[Optional[dict]],
+        fetched_at: datetime
+    ) -> List['Repository']:
+        """
+        Create Repositories for a page of GraphQL nodes.
+        
+        All nodes of one API response share a single `fetched_at`
+        timestamp. Null nodes and nodes without a databaseId (e.g.
+        inaccessible repositories) are dropped, malformed ones are
+        logged and skipped.
+        
+        Args:
+            nodes: Repository nodes from one GraphQL response
+            fetched_at: When the response was fetched
+            
+        Returns:
+            Repository instances for the valid nodes
+        """
+        repositories = []
+        for node in nodes:
+            if node is None or node.get('databaseId') is None:
+                continue
+            try:
+                repositories.append(cls.from_graphql_response(node, fetched_at))
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed node: {e}")
+        return repositories
+    
+    @staticmethod
+    def rows_from_graphql(nodes: List[Optional[dict]], fetched_at: datetime) -> List[tuple]:
+        """
+        Create plain export rows for a page of GraphQL nodes.
+        
+        Applies the same validation as `from_graphql_response_batch` but
+        builds `EXPORT_COLUMNS` tuples directly, for export paths that
+        don't need Repository objects.
+        
+        Args:
+            nodes: Repository nodes from one GraphQL response
+            fetched_at: When the response was fetched
+            
+        Returns:
+            One tuple per valid node
+        """
+        fetched_at_iso = fetched_at.isoformat()
+        rows = []
+        for node in nodes:
+            if node is None or node.get('databaseId') is None:
+                continue
+            owner_login = (node.get('owner') or {}).get('login')
+            name = node.get('name')
+            if not node.get('id') or not owner_login or not name:
+                logger.warning("Skipping malformed node")
+                continue
+            rows.append((
+                node['databaseId'],
+                node['id'],
+                f"{owner_login}/{name}",
+                owner_login,
+                name,
+                node.get('stargazerCount') or 0,
+                fetched_at_iso
+            ))
+        return rows
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
         return {
@@ -6,17 +6,47 @@ Provides a clean abstraction layer between the business logic
 and database operations, following clean architecture principles.
 """
 
-import psycopg2
-from psycopg2.extras import execute_values
-from typing import List, Optional
+import os
+from operator import attrgetter
+import psycopg
+from psycopg_pool import ConnectionPool
+from typing import Dict, Iterator, List
 from contextlib import contextmanager
 import logging
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception_type,
+    before_sleep_log
+)
 
 from src.models.repository import Repository
 from src.config.database import DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
+# One getter per upsert column of a Repository, in statement parameter order
+_UPSERT_COLUMNS = tuple(
+    attrgetter(field)
+    for field in ('id', 'node_id', 'full_name', 'owner_login', 'name', 'stargazer_count', 'fetched_at')
+)
+
+
+def _copy_row_count(cur: psycopg.Cursor) -> int:
+    """
+    Rows moved by the last COPY on `cur`.
+    
+    psycopg fills `rowcount` from the COPY command tag; if it is left
+    at -1, fall back to parsing the "COPY <n>" status message.
+    """
+    if cur.rowcount >= 0:
+        return cur.rowcount
+    status = cur.statusmessage or ''
+    if status.startswith('COPY '):
+        return int(status.split()[1])
+    return 0
+
 
 class RepositoryRepository:
     """
@@ -25,47 +55,148 @@ class RepositoryRepository:
     Handles all database interactions, providing:
     - UPSERT operations for efficient updates
     - Batch operations for performance
-    - Connection management
+    - Pooled connection management
     - Export functionality
     """
     
+    # UPSERT over unnested column arrays using ON CONFLICT.
+    # Only updates if stargazer_count actually changed
+    UPSERT_QUERY = """
+        INSERT INTO repositories
+            (id, node_id, full_name, owner_login, name, stargazer_count, updated_at)
+        SELECT * FROM unnest(
+            %s::bigint[], %s::text[], %s::text[], %s::text[], %s::text[],
+            %s::int[], %s::timestamptz[]
+        ) AS t(id, node_id, full_name, owner_login, name, stargazer_count, updated_at)
+        ON CONFLICT (id) DO UPDATE SET
+            node_id = EXCLUDED.node_id,
+            full_name = EXCLUDED.full_name,
+            owner_login = EXCLUDED.owner_login,
+            name = EXCLUDED.name,
+            stargazer_count = EXCLUDED.stargazer_count,
+            -- A rename alone keeps the timestamp, sparing the updated_at index
+            updated_at = CASE
+                WHEN repositories.stargazer_count IS DISTINCT FROM EXCLUDED.stargazer_count
+                THEN EXCLUDED.updated_at
+                ELSE repositories.updated_at
+            END
+        WHERE repositories.stargazer_count IS DISTINCT FROM EXCLUDED.stargazer_count
+           OR repositories.full_name IS DISTINCT FROM EXCLUDED.full_name
+    """
+    
+    # Most rows sent per statement, keeping huge batches to bounded
+    # statements; a single crawler page (<= 100 rows) is one statement
+    UPSERT_CHUNK_SIZE = 5000
+    
+    # COPY statement behind CSV exports
+    EXPORT_QUERY = """
+        COPY (
+            SELECT 
+                id,
+                node_id,
+                full_name,
+                owner_login,
+                name,
+                stargazer_count,
+                created_at,
+                updated_at
+            FROM repositories
+            {order_by}
+        ) TO STDOUT WITH CSV HEADER
+    """
+    
+    # Matches idx_repositories_stars (stargazer_count DESC, id), so ordered
+    # exports stream from an index scan instead of sorting the table first
+    EXPORT_ORDER_BY = "ORDER BY stargazer_count DESC, id"
+    
+    # Write buffer for CSV export files
+    EXPORT_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, config: DatabaseConfig):
+        """
+        Open the connection pool.
+        
+        Args:
+            config: Database connection settings
+            
+        Raises:
+            psycopg.OperationalError: If the database is unreachable
+        """
         self._config = config
-        self._connection_pool = None
+        self._connection_pool = ConnectionPool(
+            min_size=1,
+            max_size=max(4, (os.cpu_count() or 1) * 2),
+            kwargs={
+                'host': config.host,
+                'port': config.port,
+                'dbname': config.database,
+                'user': config.user,
+                'password': config.password,
+                'connect_timeout': 5,
+                # Detect half-dead connections (NAT, PgBouncer restarts) within
+                # about a minute instead of the kernel's two-hour default
+                'keepalives': 1,
+                'keepalives_idle': 30,
+                'keepalives_interval': 10,
+                'keepalives_count': 3,
+            },
+            # Verify each connection before lending it out
+            check=ConnectionPool.check_connection,
+            open=True
+        )
+        try:
+            # Fail fast like a direct connect instead of on first use
+            self._connection_pool.wait(timeout=10)
+        except psycopg.OperationalError as e:
+            self._connection_pool.close()
+            logger.error(f"Database connection failed: {e}")
+            raise
     
     @contextmanager
     def _get_connection(self):
         """
-        Context manager for database connections.
+        Context manager lending a connection from the pool.
         
-        Ensures connections are properly closed even if exceptions occur.
+        The pool commits on a clean exit, rolls back on an exception,
+        and discards broken connections rather than reusing them.
         """
-        conn = None
         try:
-            conn = psycopg2.connect(
-                host=self._config.host,
-                port=self._config.port,
-                database=self._config.database,
-                user=self._config.user,
-                password=self._config.password,
-                connect_timeout=10
-            )
-            yield conn
-        except psycopg2.OperationalError as e:
+            with self._connection_pool.connection() as conn:
+                yield conn
+        except psycopg.OperationalError as e:
             logger.error(f"Database connection failed: {e}")
             raise
-        finally:
-            if conn is not None:
-                conn.close()
     
+    def close(self) -> None:
+        """Close all pooled connections. Safe to call more than once."""
+        self._connection_pool.close()
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((psycopg.OperationalError, psycopg.InterfaceError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
     def upsert_batch(self, repositories: List[Repository]) -> int:
         """
         Insert or update repositories in batch.
         
+        The batch is sent as seven column arrays that are unnested
+        server-side, through a prepared statement so the plan is built
+        once per connection rather than once per batch. Batches over
+        UPSERT_CHUNK_SIZE rows are split into several statements that
+        are pipelined in the same transaction, without waiting on each
+        result.
         Uses PostgreSQL's ON CONFLICT (UPSERT) for efficient operations:
         - New repos are inserted
         - Existing repos are updated only if star count changed
         - Minimal rows affected for efficiency
+        - Repeated ids within the batch are sent once (last one wins)
+        
+        Connection failures are retried on a fresh pooled connection (the
+        pool discards the broken one); the upsert is idempotent, so a
+        retried batch is safe.
         
         Args:
             repositories: List of Repository objects to upsert
@@ -76,61 +207,64 @@ class RepositoryRepository:
         if not repositories:
             return 0
         
+        # Drop repeated ids (last one wins): ON CONFLICT DO UPDATE cannot
+        # touch the same row twice in one statement
+        unique_repos = {repo.id: repo for repo in repositories}
+        if len(unique_repos) < len(repositories):
+            logger.debug(
+                f"Dropped {len(repositories) - len(unique_repos)} duplicate repositories from batch"
+            )
+        
+        # Each array parameter is filled by a C-level map over the batch,
+        # without building (and transposing) per-row tuples
+        columns = [list(map(column, unique_repos.values())) for column in _UPSERT_COLUMNS]
+        
         with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                # Prepare data for batch insert
-                values = [
-                    (
-                        repo.id,
-                        repo.node_id,
-                        repo.full_name,
-                        repo.owner_login,
-                        repo.name,
-                        repo.stargazer_count,
-                        repo.fetched_at
-                    )
-                    for repo in repositories
-                ]
-                
-                # UPSERT query using ON CONFLICT
-                # Only updates if stargazer_count actually changed
-                query = """
-                    INSERT INTO repositories 
-                        (id, node_id, full_name, owner_login, name, stargazer_count, updated_at)
-                    VALUES %s
-                    ON CONFLICT (id) DO UPDATE SET
-                        node_id = EXCLUDED.node_id,
-                        full_name = EXCLUDED.full_name,
-                        owner_login = EXCLUDED.owner_login,
-                        name = EXCLUDED.name,
-                        stargazer_count = EXCLUDED.stargazer_count,
-                        updated_at = EXCLUDED.updated_at
-                    WHERE repositories.stargazer_count IS DISTINCT FROM EXCLUDED.stargazer_count
-                       OR repositories.full_name IS DISTINCT FROM EXCLUDED.full_name
-                """
-                
-                try:
-                    execute_values(cur, query, values, page_size=100)
-                    affected = cur.rowcount
-                    conn.commit()
-                    return affected
-                except psycopg2.Error as e:
-                    conn.rollback()
-                    logger.error(f"Batch upsert failed: {e}")
-                    raise
+            try:
+                with conn.pipeline():
+                    cursors = [
+                        conn.execute(
+                            self.UPSERT_QUERY,
+                            [column[start:start + self.UPSERT_CHUNK_SIZE] for column in columns],
+                            prepare=True
+                        )
+                        for start in range(0, len(unique_repos), self.UPSERT_CHUNK_SIZE)
+                    ]
+                affected = sum(cur.rowcount for cur in cursors)
+                conn.commit()
+            except psycopg.Error as e:
+                conn.rollback()
+                logger.error(f"Batch upsert failed: {e}")
+                raise
+        
+        return affected
+    
+    @contextmanager
+    def _server_cursor(self, name: str = 'stream', itersize: int = 10000):
+        """
+        Context manager for a named (server-side) cursor on a pooled connection.
+        
+        Rows are fetched `itersize` at a time as the cursor is iterated,
+        so full-table reads keep client and backend memory bounded.
+        Named cursors live inside a transaction, which pooled connections
+        open implicitly.
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(name=name) as cur:
+                cur.itersize = itersize
+                yield cur
     
     def get_count(self) -> int:
         """
         Get total number of repositories in database.
         
+        Derived from `get_stats`, which computes the count in the same
+        scan; callers wanting both should call `get_stats` once.
+        
         Returns:
             Count of repository records
         """
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM repositories")
-                result = cur.fetchone()
-                return result[0] if result else 0
+        return self.get_stats()['total_repos']
     
     def get_stats(self) -> dict:
         """
@@ -159,47 +293,74 @@ class RepositoryRepository:
                     'total_stars': row[4]
                 }
     
-    def export_to_csv(self, filepath: str) -> int:
+    def _copy_export(self, result: Dict[str, int], ordered: bool) -> Iterator[bytes]:
+        """
+        Run the export COPY and yield its output as it arrives.
+        
+        Closing the iterator early cancels the COPY. Once the iterator is
+        exhausted, `result['rows']` holds the row count reported by COPY
+        itself.
+        
+        Args:
+            result: Dict that receives the exported row count
+            ordered: Sort most starred first
+            
+        Yields:
+            Chunks of CSV-encoded bytes
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                query = self.EXPORT_QUERY.format(
+                    order_by=self.EXPORT_ORDER_BY if ordered else ''
+                )
+                with cur.copy(query) as copy:
+                    for data in copy:
+                        yield bytes(data)
+                result['rows'] = _copy_row_count(cur)
+    
+    def stream_csv(self, ordered: bool = False) -> Iterator[bytes]:
+        """
+        Stream all repositories as CSV, header first.
+        
+        Chunks are yielded straight from the COPY stream, so the first
+        bytes are available at once and memory stays flat whatever the
+        table size. Closing the iterator early cancels the COPY.
+        
+        Args:
+            ordered: Sort most starred first; unordered exports are a
+                plain sequential scan
+            
+        Yields:
+            Chunks of CSV-encoded bytes
+            
+        Raises:
+            psycopg.Error: If the export query fails
+        """
+        return self._copy_export({}, ordered)
+    
+    def export_to_csv(self, filepath: str, ordered: bool = False) -> int:
         """
         Export all repositories to CSV file.
         
-        Uses PostgreSQL's COPY command for efficient bulk export.
+        Writes the streamed COPY output to disk; the row count comes from
+        the COPY command tag rather than a separate COUNT(*) scan.
         
         Args:
             filepath: Path to output CSV file
+            ordered: Sort most starred first
             
         Returns:
             Number of rows exported
         """
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                # First get count for return value
-                cur.execute("SELECT COUNT(*) FROM repositories")
-                count = cur.fetchone()[0]
-                
-                # Export using COPY for best performance
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    cur.copy_expert(
-                        """
-                        COPY (
-                            SELECT 
-                                id,
-                                node_id,
-                                full_name,
-                                owner_login,
-                                name,
-                                stargazer_count,
-                                created_at,
-                                updated_at
-                            FROM repositories
-                            ORDER BY stargazer_count DESC
-                        ) TO STDOUT WITH CSV HEADER
-                        """,
-                        f
-                    )
-                
-                logger.info(f"Exported {count} repositories to {filepath}")
-                return count
+        result = {'rows': 0}
+        # COPY output is already UTF-8, so write it unencoded in large blocks
+        with open(filepath, 'wb', buffering=self.EXPORT_BUFFER_SIZE) as f:
+            for chunk in self._copy_export(result, ordered):
+                f.write(chunk)
+        
+        count = result['rows']
+        logger.info(f"Exported {count} repositories to {filepath}")
+        return count
     
     def truncate(self) -> None:
         """
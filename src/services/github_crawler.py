@@ -9,14 +9,34 @@ business logic specific to either.
 
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
+import csv
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from src.adapters.github_api import GitHubGraphQLAdapter
 from src.repositories.repo_repository import RepositoryRepository
 from src.config.database import DatabaseConfig, GitHubConfig
+from src.models.repository import Repository
 
 logger = logging.getLogger(__name__)
 
+# Sentinel marking the end of the fetched batch stream
+_FETCH_DONE = object()
+
+
+def _put_batch(batches: queue.Queue, item: object, stop: threading.Event) -> bool:
+    """Put onto the bounded batch queue, giving up once the writer has stopped."""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
 
 class GitHubCrawlerService:
     """
@@ -26,9 +46,13 @@ class GitHubCrawlerService:
     - Coordinates between GitHub API and database layers
     - Manages the crawl workflow
     - Provides progress reporting
-    - Handles graceful shutdown
+    - Handles graceful shutdown via close()
     """
     
+    # Batches upserted concurrently; fits within the repository's
+    # connection pool (at least 4 connections)
+    DB_WRITERS = 4
+    
     def __init__(
         self,
         github_config: GitHubConfig,
@@ -46,23 +70,66 @@ class GitHubCrawlerService:
         self._github_adapter: Optional[GitHubGraphQLAdapter] = None
         self._repo_repository: Optional[RepositoryRepository] = None
     
-    def _ensure_initialized(self) -> None:
-        """Lazy initialization of adapters."""
+    def _ensure_adapter(self) -> None:
+        """Lazy initialization of the GitHub adapter alone."""
         if self._github_adapter is None:
             self._github_adapter = GitHubGraphQLAdapter(
                 token=self._github_config.token,
-                endpoint=self._github_config.graphql_endpoint
+                endpoint=self._github_config.graphql_endpoint,
+                rest_endpoint=self._github_config.rest_endpoint,
+                aliases_per_query=self._github_config.aliases_per_query,
+                max_workers=self._github_config.max_workers
             )
+    
+    def _ensure_initialized(self) -> None:
+        """Lazy initialization of adapters."""
+        self._ensure_adapter()
         if self._repo_repository is None:
             self._repo_repository = RepositoryRepository(self._db_config)
     
+    def _fetch_batches(
+        self,
+        search_query: str,
+        batch_size: int,
+        max_repos: int,
+        batches: queue.Queue,
+        stop: threading.Event
+    ) -> None:
+        """
+        Producer thread body: feed GitHub batches into `batches`.
+        
+        Errors are handed to the writer through the queue, and the
+        stream always ends with `_FETCH_DONE`. `stop` is also handed to
+        the adapter, so a waiting search returns as soon as the writer
+        gives up.
+        """
+        pages = self._github_adapter.search_repositories(
+            query_string=search_query,
+            batch_size=batch_size,
+            max_repos=max_repos,
+            cancel=stop
+        )
+        try:
+            for batch in pages:
+                if not _put_batch(batches, batch, stop):
+                    break
+        except Exception as e:
+            _put_batch(batches, e, stop)
+        finally:
+            pages.close()
+            _put_batch(batches, _FETCH_DONE, stop)
+    
     def crawl_stars(self, search_query: str = "stars:>=0") -> Dict[str, Any]:
         """
         Crawl GitHub repositories and store in database.
         
         This is the main entry point for the crawl operation.
         It fetches repositories from GitHub API and stores them
-        in PostgreSQL using efficient batch upserts.
+        in PostgreSQL using efficient batch upserts. Fetching runs on a
+        producer thread, so the next GitHub page is already in flight
+        while batches are written; up to DB_WRITERS batches are upserted
+        concurrently on pooled connections. Small bounded queues between
+        the stages keep memory flat.
         
         Args:
             search_query: GitHub search query (additional filters)
@@ -76,7 +143,9 @@ class GitHubCrawlerService:
         """
         self._ensure_initialized()
         
+        # Wall-clock times are only for reporting; rates use the monotonic clock
         start_time = datetime.now(timezone.utc)
+        start_mono = time.monotonic()
         total_crawled = 0
         total_upserted = 0
         batch_count = 0
@@ -91,23 +160,39 @@ class GitHubCrawlerService:
         logger.info(f"Start time: {start_time.isoformat()}")
         logger.info(f"=" * 60)
         
+        batches: queue.Queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        fetcher = threading.Thread(
+            target=self._fetch_batches,
+            args=(search_query, batch_size, max_repos, batches, stop),
+            name='github-fetch',
+            daemon=True
+        )
+        writers = ThreadPoolExecutor(max_workers=self.DB_WRITERS, thread_name_prefix='db-writer')
+        in_flight = set()
+        
         try:
-            # Iterate through batches from GitHub API
-            for batch in self._github_adapter.search_repositories(
-                query_string=search_query,
-                batch_size=batch_size,
-                max_repos=max_repos
-            ):
+            fetcher.start()
+            
+            # Consume batches fetched from GitHub API
+            while True:
+                batch = batches.get()
+                if batch is _FETCH_DONE:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
                 batch_count += 1
                 
-                # Upsert batch to database
-                affected = self._repo_repository.upsert_batch(batch)
+                # Upsert batch to database, waiting for a free writer first
+                if len(in_flight) >= self.DB_WRITERS:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    total_upserted += sum(future.result() for future in done)
+                in_flight.add(writers.submit(self._repo_repository.upsert_batch, batch))
                 total_crawled += len(batch)
-                total_upserted += affected
                 
                 # Progress logging every 10 batches
                 if batch_count % 10 == 0:
-                    elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
+                    elapsed = time.monotonic() - start_mono
                     rate = total_crawled / elapsed if elapsed > 0 else 0
                     logger.info(
                         f"Progress: {total_crawled:,}/{max_repos:,} repos "
@@ -118,6 +203,10 @@ class GitHubCrawlerService:
                 
                 if total_crawled >= max_repos:
                     break
+            
+            # Wait for the last batches to be written
+            done, in_flight = wait(in_flight)
+            total_upserted += sum(future.result() for future in done)
         
         except KeyboardInterrupt:
             logger.warning("Crawl interrupted by user")
@@ -125,12 +214,14 @@ class GitHubCrawlerService:
             logger.error(f"Crawl error: {e}")
             raise
         finally:
-            if self._github_adapter:
-                self._github_adapter.close()
-                self._github_adapter = None
+            # Let the fetcher finish its current page before returning
+            stop.set()
+            if fetcher.is_alive():
+                fetcher.join()
+            writers.shutdown(wait=True, cancel_futures=True)
         
         end_time = datetime.now(timezone.utc)
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_mono
         
         stats = {
             'total_crawled': total_crawled,
@@ -152,21 +243,69 @@ class GitHubCrawlerService:
         
         return stats
     
-    def export_data(self, filepath: str) -> int:
+    def crawl_to_csv(self, filepath: str) -> int:
+        """
+        Crawl GitHub repositories straight into a CSV file, skipping the database.
+        
+        Uses the adapter's raw row stream, so no Repository objects are
+        built, and no database connection is opened. Columns follow
+        `Repository.EXPORT_COLUMNS`. Repositories are written in crawl
+        order; unlike `crawl_stars` nothing is deduplicated against
+        earlier runs.
+        
+        Args:
+            filepath: Output file path
+            
+        Returns:
+            Number of rows written
+        """
+        self._ensure_adapter()
+        count = 0
+        
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(Repository.EXPORT_COLUMNS)
+            for rows in self._github_adapter.search_repositories_raw(
+                batch_size=self._github_config.batch_size,
+                max_repos=self._github_config.max_repos
+            ):
+                writer.writerows(rows)
+                count += len(rows)
+        
+        logger.info(f"Crawled {count:,} repositories directly to {filepath}")
+        return count
+    
+    def export_data(self, filepath: str, ordered: bool = False) -> int:
         """
         Export crawled data to CSV file.
         
         Args:
             filepath: Output file path
+            ordered: Sort most starred first
             
         Returns:
             Number of rows exported
         """
         self._ensure_initialized()
-        count = self._repo_repository.export_to_csv(filepath)
+        count = self._repo_repository.export_to_csv(filepath, ordered=ordered)
         logger.info(f"Data exported to {filepath} ({count:,} rows)")
         return count
     
+    def close(self) -> None:
+        """
+        Release the GitHub HTTP session and database pool.
+        
+        Both are kept open across crawls so repeated runs reuse warm
+        connections; call this once on shutdown. Safe to call more
+        than once.
+        """
+        if self._github_adapter:
+            self._github_adapter.close()
+            self._github_adapter = None
+        if self._repo_repository:
+            self._repo_repository.close()
+            self._repo_repository = None
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about stored data.